@@ -0,0 +1,327 @@
+"""
+Offline batch voice analysis over recorded interview archives.
+
+Runs the same pipeline as /api/analyze-voice-comprehensive over every
+recording in a directory or manifest, across a pool of worker processes.
+
+    python batch_analyze.py recordings/ -o results.jsonl
+    python batch_analyze.py --manifest manifest.jsonl -o results.parquet -w 8
+
+Directory mode picks up audio files recursively and reads the transcript
+from a sibling ``<name>.txt`` (empty if missing). Manifest mode reads one
+JSON object per line with ``audio`` and either ``transcript`` or
+``transcript_path``, plus optional ``id`` and ``duration``; relative paths
+are resolved against the manifest's folder. When no duration is given it
+is taken from the decoded audio.
+
+Results are appended as they arrive. Re-running with the same output skips
+every item already recorded successfully, so an interrupted run resumes
+where it stopped and failed items are retried. Parquet output is a folder
+of part files and needs pyarrow installed (pip install pyarrow).
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = {'.webm', '.wav', '.mp3', '.m4a', '.ogg', '.flac', '.mp4'}
+
+# Scratch folder for decoded WAV files, shared by all workers of a run
+_scratch_dir = None
+
+
+def _read_text(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().strip()
+
+
+def scan_directory(root):
+    items = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() not in AUDIO_EXTENSIONS:
+                continue
+            audio_path = os.path.join(dirpath, filename)
+            transcript_path = os.path.join(dirpath, stem + '.txt')
+            items.append({
+                'id': os.path.relpath(audio_path, root).replace(os.sep, '/'),
+                'audio': audio_path,
+                'transcript_path': transcript_path if os.path.exists(transcript_path) else None,
+                'transcript': None,
+                'duration': None
+            })
+    return items
+
+
+def read_manifest(manifest_path):
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    items = []
+    seen_ids = set()
+    with open(manifest_path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if 'audio' not in entry:
+                raise ValueError(f"{manifest_path}:{line_number}: missing 'audio'")
+            item_id = str(entry.get('id', entry['audio']))
+            if item_id in seen_ids:
+                raise ValueError(f"{manifest_path}:{line_number}: duplicate id '{item_id}'")
+            seen_ids.add(item_id)
+            transcript_path = entry.get('transcript_path')
+            items.append({
+                'id': item_id,
+                'audio': os.path.join(base_dir, entry['audio']),
+                'transcript_path': os.path.join(base_dir, transcript_path) if transcript_path else None,
+                'transcript': entry.get('transcript'),
+                'duration': entry.get('duration')
+            })
+    return items
+
+
+def _init_worker(scratch_dir):
+    global _scratch_dir
+    _scratch_dir = scratch_dir
+
+
+def _process_item(item):
+    """
+    Decodes and analyzes one recording inside a worker process
+    """
+    import librosa
+    from voice_analysis import convert_to_wav, analyze_voice
+
+    start = time.perf_counter()
+    record = {'id': item['id'], 'audio': item['audio']}
+    wav_path = os.path.join(_scratch_dir, f"{os.getpid()}.wav")
+    try:
+        transcript = item['transcript']
+        if transcript is None:
+            transcript = _read_text(item['transcript_path']) if item['transcript_path'] else ''
+
+        convert_to_wav(item['audio'], wav_path)
+        duration = item['duration']
+        if duration is None:
+            duration = librosa.get_duration(path=wav_path)
+
+        record.update(success=True, **analyze_voice(wav_path, transcript, float(duration)))
+    except Exception as e:
+        record.update(success=False, error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+    finally:
+        if os.path.exists(wav_path):
+            os.unlink(wav_path)
+    record['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def completed_ids(self):
+        if not os.path.exists(self.path):
+            return set()
+        completed = set()
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            # Drop a partial trailing line left behind by an interrupted run
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+                data = data[:data.rfind(b'\n') + 1]
+        for line_number, line in enumerate(data.decode('utf-8').splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"{self.path}:{line_number}: skipping unreadable line")
+                continue
+            if record.get('success'):
+                completed.add(record['id'])
+        return completed
+
+    def write(self, record):
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ParquetWriter:
+    """
+    Writes flat score columns plus the full result as JSON, one part file
+    per flush so completed parts survive an interruption
+    """
+    COLUMNS = ['confidence', 'nervousness', 'fluency']
+    SUMMARY_COLUMNS = ['words_per_minute', 'filler_count', 'stammer_count', 'voice_breaks']
+
+    def __init__(self, path, flush_every):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+        self._pa = pa
+        self._pq = pq
+        # Fixed schema so every part file agrees, even when a part holds only
+        # successes (no errors) or only failures (no scores)
+        self.schema = pa.schema([
+            ('id', pa.string()),
+            ('audio', pa.string()),
+            ('success', pa.bool_()),
+            ('error', pa.string()),
+            ('elapsed_seconds', pa.float64()),
+            ('result', pa.string()),
+            ('confidence', pa.float64()),
+            ('nervousness', pa.float64()),
+            ('fluency', pa.float64()),
+            ('words_per_minute', pa.float64()),
+            ('filler_count', pa.int64()),
+            ('stammer_count', pa.int64()),
+            ('voice_breaks', pa.int64())
+        ])
+        self.path = path
+        self.flush_every = flush_every
+        self._rows = []
+        os.makedirs(path, exist_ok=True)
+
+    def _part_files(self):
+        return sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.startswith('part-') and name.endswith('.parquet')
+        )
+
+    def completed_ids(self):
+        completed = set()
+        for part in self._part_files():
+            table = self._pq.read_table(part, columns=['id', 'success'])
+            for item_id, success in zip(table.column('id').to_pylist(), table.column('success').to_pylist()):
+                if success:
+                    completed.add(item_id)
+        return completed
+
+    def write(self, record):
+        scores = record.get('scores', {})
+        summary = record.get('summary', {})
+        row = {
+            'id': record['id'],
+            'audio': record['audio'],
+            'success': record['success'],
+            'error': record.get('error'),
+            'elapsed_seconds': record['elapsed_seconds'],
+            'result': json.dumps(record)
+        }
+        for column in self.COLUMNS:
+            row[column] = scores.get(column)
+        for column in self.SUMMARY_COLUMNS:
+            row[column] = summary.get(column)
+        self._rows.append(row)
+        if len(self._rows) >= self.flush_every:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        part = os.path.join(self.path, f"part-{len(self._part_files()):05d}.parquet")
+        tmp_path = part + '.tmp'
+        table = self._pa.Table.from_pylist(self._rows, schema=self.schema)
+        self._pq.write_table(table, tmp_path)
+        os.replace(tmp_path, part)
+        self._rows = []
+
+    def close(self):
+        self._flush()
+
+
+def make_writer(output, output_format, flush_every):
+    if output_format is None:
+        output_format = 'parquet' if output.endswith('.parquet') else 'jsonl'
+    if output_format == 'parquet':
+        return ParquetWriter(output, flush_every)
+    return JsonlWriter(output)
+
+
+def run_batch(items, writer, workers, log_every):
+    completed = writer.completed_ids()
+    pending = [item for item in items if item['id'] not in completed]
+    logger.info(f"{len(items)} items found, {len(items) - len(pending)} already done, {len(pending)} to process")
+    if not pending:
+        return 0, 0
+
+    processed = failed = 0
+    scratch_dir = tempfile.mkdtemp(prefix='voice-batch-')
+    start = time.perf_counter()
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(scratch_dir,)) as pool:
+            for record in pool.imap_unordered(_process_item, pending):
+                writer.write(record)
+                processed += 1
+                if not record['success']:
+                    failed += 1
+                    logger.warning(f"{record['id']}: {record['error']}")
+                if processed % log_every == 0 or processed == len(pending):
+                    elapsed = time.perf_counter() - start
+                    logger.info(
+                        f"{processed}/{len(pending)} files, {failed} failed, "
+                        f"{processed / elapsed:.2f} files/s"
+                    )
+            pool.close()
+            pool.join()
+    finally:
+        writer.close()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    return processed, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch voice analysis over recorded interviews")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('directory', nargs='?', help="folder of recordings with sibling .txt transcripts")
+    source.add_argument('--manifest', help="JSONL manifest of recordings")
+    parser.add_argument('-o', '--output', required=True, help="results .jsonl file or .parquet folder")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], help="output format (default: from extension)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--flush-every', type=int, default=100, help="rows per Parquet part file")
+    parser.add_argument('--log-every', type=int, default=10, help="log throughput every N files")
+    args = parser.parse_args(argv)
+
+    items = read_manifest(args.manifest) if args.manifest else scan_directory(args.directory)
+    writer = make_writer(args.output, args.format, args.flush_every)
+
+    start = time.perf_counter()
+    try:
+        processed, failed = run_batch(items, writer, args.workers, args.log_every)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; completed results are saved and will be skipped on the next run")
+        return 130
+    elapsed = time.perf_counter() - start
+    if processed:
+        logger.info(
+            f"Done: {processed} files ({failed} failed) in {elapsed:.1f}s, "
+            f"{processed / elapsed:.2f} files/s"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
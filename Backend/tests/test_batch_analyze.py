@@ -0,0 +1,130 @@
+import json
+import os
+
+import pytest
+
+import batch_analyze
+
+
+def fake_process_item(item):
+    return {'id': item['id'], 'audio': item['audio'], 'success': True, 'elapsed_seconds': 0.0}
+
+
+def write_lines(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def test_scan_directory_pairs_transcripts(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.webm').write_bytes(b'x')
+    (tmp_path / 'a.txt').write_text('um hello')
+    (tmp_path / 'sub' / 'b.WAV').write_bytes(b'x')
+    (tmp_path / 'notes.md').write_text('ignored')
+
+    items = batch_analyze.scan_directory(str(tmp_path))
+
+    assert [item['id'] for item in items] == ['a.webm', 'sub/b.WAV']
+    assert items[0]['transcript_path'] == str(tmp_path / 'a.txt')
+    assert items[1]['transcript_path'] is None
+
+
+def test_read_manifest_resolves_relative_paths(tmp_path):
+    manifest = tmp_path / 'manifest.jsonl'
+    write_lines(manifest, [
+        {'audio': 'rec/a.webm', 'transcript_path': 'rec/a.txt', 'duration': 12.5},
+        {'id': 'second', 'audio': '/abs/b.webm', 'transcript': 'hello'}
+    ])
+
+    items = batch_analyze.read_manifest(str(manifest))
+
+    assert items[0]['id'] == 'rec/a.webm'
+    assert items[0]['audio'] == str(tmp_path / 'rec' / 'a.webm')
+    assert items[0]['transcript_path'] == str(tmp_path / 'rec' / 'a.txt')
+    assert items[0]['duration'] == 12.5
+    assert items[1]['id'] == 'second'
+    assert items[1]['audio'] == '/abs/b.webm'
+    assert items[1]['transcript'] == 'hello'
+
+
+def test_read_manifest_rejects_duplicate_ids(tmp_path):
+    manifest = tmp_path / 'manifest.jsonl'
+    write_lines(manifest, [{'audio': 'a.webm'}, {'audio': 'a.webm'}])
+
+    with pytest.raises(ValueError, match=':2: duplicate id'):
+        batch_analyze.read_manifest(str(manifest))
+
+
+def test_read_manifest_requires_audio(tmp_path):
+    manifest = tmp_path / 'manifest.jsonl'
+    write_lines(manifest, [{'id': 'x'}])
+
+    with pytest.raises(ValueError, match="missing 'audio'"):
+        batch_analyze.read_manifest(str(manifest))
+
+
+def test_completed_ids_truncates_partial_line(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    write_lines(output, [{'id': 'a', 'success': True}])
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write('{"id": "b", "succ')
+
+    writer = batch_analyze.JsonlWriter(str(output))
+
+    assert writer.completed_ids() == {'a'}
+    assert output.read_text().endswith('}\n')
+
+
+def test_completed_ids_retries_failed_and_skips_bad_lines(tmp_path):
+    output = tmp_path / 'results.jsonl'
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'id': 'a', 'success': True}) + '\n')
+        f.write('not json\n')
+        f.write(json.dumps({'id': 'b', 'success': False, 'error': 'boom'}) + '\n')
+
+    writer = batch_analyze.JsonlWriter(str(output))
+
+    assert writer.completed_ids() == {'a'}
+
+
+def test_run_batch_skips_completed_items(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_analyze, '_process_item', fake_process_item)
+    output = tmp_path / 'results.jsonl'
+    write_lines(output, [{'id': 'a', 'success': True}, {'id': 'b', 'success': False}])
+    items = [{'id': item_id, 'audio': item_id + '.webm'} for item_id in ['a', 'b', 'c']]
+
+    processed, failed = batch_analyze.run_batch(items, batch_analyze.JsonlWriter(str(output)), 2, 10)
+
+    assert (processed, failed) == (2, 0)
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record['id'] for record in records[2:]) == ['b', 'c']
+
+
+def test_run_batch_removes_scratch_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_analyze, '_process_item', fake_process_item)
+    monkeypatch.setattr(batch_analyze.tempfile, 'tempdir', str(tmp_path))
+    items = [{'id': 'a', 'audio': 'a.webm'}]
+
+    batch_analyze.run_batch(items, batch_analyze.JsonlWriter(str(tmp_path / 'results.jsonl')), 1, 10)
+
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('voice-batch-')]
+
+
+def test_parquet_parts_share_schema(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    output = tmp_path / 'results.parquet'
+    writer = batch_analyze.ParquetWriter(str(output), flush_every=1)
+    writer.write({
+        'id': 'a', 'audio': 'a.webm', 'success': True, 'elapsed_seconds': 1.0,
+        'scores': {'confidence': 80.0, 'nervousness': 10.0, 'fluency': 90.0},
+        'summary': {'words_per_minute': 140.0, 'filler_count': 2, 'stammer_count': 0, 'voice_breaks': 1}
+    })
+    writer.write({'id': 'b', 'audio': 'b.webm', 'success': False, 'error': 'boom', 'elapsed_seconds': 0.5})
+    writer.close()
+
+    assert writer.completed_ids() == {'a'}
+    table = pq.read_table(str(output))
+    assert table.num_rows == 2
+    assert table.schema.field('confidence').type == 'double'
+    assert table.schema.field('error').type == 'string'
@@ -0,0 +1,91 @@
+import subprocess
+
+from audio_processing.pitch_analyzer import analyze_pitch
+from audio_processing.energy_analyzer import analyze_energy
+from audio_processing.voice_break_detector import detect_voice_breaks
+from audio_processing.speech_rate_analyzer import analyze_speech_rate
+from text_processing.filler_word_detector import detect_filler_words
+from text_processing.stammering_detector import detect_stammering
+from text_processing.pause_analyzer import analyze_pauses
+from scoring.confidence_scorer import calculate_confidence_score
+from scoring.nervousness_scorer import calculate_nervousness_score
+
+
+def convert_to_wav(input_path, wav_path):
+    """
+    Decodes any FFmpeg-readable recording to 16 kHz mono PCM WAV
+    """
+    subprocess.run([
+        r"ffmpeg",
+        "-i", input_path,
+        "-acodec", "pcm_s16le",
+        "-ar", "16000",
+        "-ac", "1",
+        wav_path,
+        "-y"
+    ], check=True, capture_output=True)
+
+
+def analyze_voice(wav_path, transcript, duration):
+    """
+    Runs the DSP, text and scoring pipeline over a decoded WAV file
+    """
+    # DSP Analysis
+    pitch_results = analyze_pitch(wav_path)
+    energy_results = analyze_energy(wav_path)
+    voice_break_results = detect_voice_breaks(wav_path)
+    speech_rate_results = analyze_speech_rate(wav_path)
+
+    dsp_results = {
+        'pitch': pitch_results,
+        'energy': energy_results,
+        'voice_breaks': voice_break_results,
+        'speech_rate': speech_rate_results
+    }
+
+    # Text Analysis
+    filler_results = detect_filler_words(transcript)
+    stammer_results = detect_stammering(transcript)
+    pause_results = analyze_pauses(transcript, duration)
+
+    text_results = {
+        'filler_words': filler_results,
+        'stammering': stammer_results,
+        'pauses': pause_results
+    }
+
+    # MORE LENIENT SCORING
+    # Base confidence score (higher baseline)
+    confidence_score = calculate_confidence_score(dsp_results, text_results)
+    # Boost confidence by 15% to be more encouraging
+    confidence_score = min(100, confidence_score * 1.15)
+
+    # Nervousness (reduce impact)
+    nervousness_score = calculate_nervousness_score(dsp_results, text_results)
+    # Reduce nervousness score by 25%
+    nervousness_score = nervousness_score * 0.75
+
+    # Fluency (more forgiving)
+    fluency_base = 100 - nervousness_score
+    # Reduce penalties
+    fluency_penalty = (
+        filler_results.get('confidence_penalty', 0) * 0.15 +  # Reduced from 0.3
+        stammer_results.get('fluency_penalty', 0) * 0.25      # Reduced from 0.5
+    )
+    fluency_score = max(40, fluency_base - fluency_penalty)  # Minimum 40% instead of 0%
+
+    return {
+        "scores": {
+            "confidence": round(confidence_score, 2),
+            "nervousness": round(nervousness_score, 2),
+            "fluency": round(fluency_score, 2)
+        },
+        "dsp_analysis": dsp_results,
+        "text_analysis": text_results,
+        "summary": {
+            "words_per_minute": speech_rate_results.get('words_per_minute', 0),
+            "filler_count": filler_results.get('filler_count', 0),
+            "stammer_count": stammer_results.get('stammer_count', 0),
+            "voice_breaks": voice_break_results.get('total_breaks', 0)
+        }
+    }